@@ -1,39 +1,11 @@
-import { GoogleGenerativeAI } from "@google/generative-ai";
 import { NextRequest, NextResponse } from "next/server";
+import { generateText, LLMError, promptTemplate } from "@/utils/llmClient";
 
-export async function POST(req: NextRequest) {
-    try {
-        let { userTask, adhdType, apiKey } = await req.json();
-
-
-        if (!userTask || userTask.length === 0) {
-            return NextResponse.json({ error: "No task provided, task is needed!" },
-                { status: 400 });
-        }
-
-        if (!adhdType || !["inattentive", "hyperactive", "combined"].includes(adhdType)) {
-            adhdType = "combined";
-        }
-
-        // Check for API key: first from request body, then from environment
-        const googleAPIKey = apiKey || process.env.GOOGLE_API_KEY;
-
+// Vercel stops the function after this many seconds. The LLM client gives up
+// a few seconds earlier (LLM_DEADLINE_MS) so the error can still be returned.
+export const maxDuration = 30;
 
-        if (!googleAPIKey || googleAPIKey.trim() === "") {
-            return NextResponse.json({ 
-                error: "Google API key is not set",
-                requiresApiKey: true 
-            }, { status: 500 });
-        } else {
-            console.log("Google API key is set");
-        }
-
-        // initializing Google Gemini for task breakdown
-
-        const genAI = new GoogleGenerativeAI(googleAPIKey);
-        const model = genAI.getGenerativeModel({ model: "gemini-2.5-flash" });
-
-        const prompt = `
+const BREAK_TASK_PROMPT = promptTemplate(`
         You are an ADHD-aware task structuring assistant.
 
         Break down the user's task into actionable subtasks based on their ADHD subtype.
@@ -58,22 +30,50 @@ export async function POST(req: NextRequest) {
         - Medium-length steps
         - Balanced stimulation
 
-        User ADHD subtype: ${adhdType}
-        User task: "${userTask}"
+        User ADHD subtype: {{adhdType}}
+        User task: "{{userTask}}"
 
         Return ONLY clean JSON:
 
         {
-        "subtype": "${adhdType}",
-        "original_task": "${userTask}",
+        "subtype": "{{adhdType}}",
+        "original_task": "{{userTask}}",
         "subtasks": [],
         "explanation": ""
         }
 
         Let the format of each subtask be continous text, the subtask a array of string, where each item is a subtask. no list items or other formatting for all types of ADHD subtypes.
-        `
-        const response = await model.generateContent(prompt);
-        const result = response.response.text();
+        `);
+
+export async function POST(req: NextRequest) {
+    try {
+        let { userTask, adhdType, apiKey } = await req.json();
+
+
+        if (!userTask || userTask.length === 0) {
+            return NextResponse.json({ error: "No task provided, task is needed!" },
+                { status: 400 });
+        }
+
+        if (!adhdType || !["inattentive", "hyperactive", "combined"].includes(adhdType)) {
+            adhdType = "combined";
+        }
+
+        // Check for API key: first from request body, then from environment
+        const googleAPIKey = apiKey || process.env.GOOGLE_API_KEY;
+
+
+        if (!googleAPIKey || googleAPIKey.trim() === "") {
+            return NextResponse.json({ 
+                error: "Google API key is not set",
+                requiresApiKey: true 
+            }, { status: 500 });
+        } else {
+            console.log("Google API key is set");
+        }
+
+        const prompt = BREAK_TASK_PROMPT.render({ adhdType, userTask });
+        const result = await generateText(googleAPIKey, prompt);
 
         let parsedResult : { subtype: string, original_task: string, subtasks: string[], explanation: string };
 
@@ -128,6 +128,16 @@ export async function POST(req: NextRequest) {
 
     } catch (error) {
         console.error("Error in API route:", error);
+        if (error instanceof LLMError) {
+            return NextResponse.json(
+                {
+                    error: error.retryable
+                        ? "The AI service is busy right now. Please try again in a moment."
+                        : "The AI service could not process this request.",
+                },
+                { status: error.retryable ? 503 : 502 }
+            );
+        }
         return NextResponse.json({ error: "Internal server error" }, { status: 500 });
     }
 }
\ No newline at end of file
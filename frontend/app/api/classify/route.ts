@@ -1,5 +1,9 @@
-import { GoogleGenerativeAI } from "@google/generative-ai";
 import { NextRequest, NextResponse } from "next/server";
+import { generateText, LLMError, promptTemplate } from "@/utils/llmClient";
+
+// Vercel stops the function after this many seconds. The LLM client gives up
+// a few seconds earlier (LLM_DEADLINE_MS) so the error can still be returned.
+export const maxDuration = 30;
 
 // Frequency mapping (same as Python notebook)
 const FREQ_MAP: Record<string, number> = {
@@ -88,6 +92,35 @@ function mapFormDataToNotebookFormat(formData: Record<string, string>): Record<s
   return mapped;
 }
 
+// Build prompt (same structure as Python notebook)
+const CLASSIFY_PROMPT = promptTemplate(`You are an expert in ADHD screening and UX personalization.
+
+Classify the user into one of these UI personas:
+
+1. Inattentive → The Calm Organizer
+2. Hyperactive–Impulsive → The Energetic Achiever
+3. Combined → The Adaptive Balancer
+
+Here are the numeric scores:
+Inattention Score = {{inattScore}}
+Hyperactivity Score = {{hyperScore}}
+
+Here are the original responses:
+{{responses}}
+
+Classification rules:
+- If Inattention >> Hyper → Inattentive subtype.
+- If Hyper >> Inattention → Hyperactive–Impulsive subtype.
+- If both are moderately high or close → Combined subtype.
+- Respond ONLY with JSON in this exact structure:
+
+{
+  "subtype": "",
+  "persona": "",
+  "reasoning": "",
+  "recommended_ui_features": []
+}`);
+
 export async function POST(req: NextRequest) {
   try {
     console.log("req", req);
@@ -150,43 +183,12 @@ export async function POST(req: NextRequest) {
       0
     );
 
-    // Initialize Google Gemini
-    const genAI = new GoogleGenerativeAI(googleAPIKey);
-    // Use gemini-pro (stablaunlallale) or gemini-1.5-flash (faster). 
-    // gemini-1.5-pro requires v1 API, not v1beta
-    const model = genAI.getGenerativeModel({ model: "gemini-2.5-flash" });
-
-    // Build prompt (same structure as Python notebook)
-    const prompt = `You are an expert in ADHD screening and UX personalization.
-
-Classify the user into one of these UI personas:
-
-1. Inattentive → The Calm Organizer
-2. Hyperactive–Impulsive → The Energetic Achiever
-3. Combined → The Adaptive Balancer
-
-Here are the numeric scores:
-Inattention Score = ${inattScore}
-Hyperactivity Score = ${hyperScore}
-
-Here are the original responses:
-${JSON.stringify(userResponses, null, 2)}
-
-Classification rules:
-- If Inattention >> Hyper → Inattentive subtype.
-- If Hyper >> Inattention → Hyperactive–Impulsive subtype.
-- If both are moderately high or close → Combined subtype.
-- Respond ONLY with JSON in this exact structure:
-
-{
-  "subtype": "",
-  "persona": "",
-  "reasoning": "",
-  "recommended_ui_features": []
-}`;
-
-    const response = await model.generateContent(prompt);
-    const result = response.response.text();
+    const prompt = CLASSIFY_PROMPT.render({
+      inattScore,
+      hyperScore,
+      responses: JSON.stringify(userResponses, null, 2),
+    });
+    const result = await generateText(googleAPIKey, prompt);
 
     // Clean and parse the result (same as Python notebook)
     let cleanedResult = result.trim();
@@ -239,6 +241,17 @@ Classification rules:
     console.error("Error in classify API route:", error);
     console.error("Error stack:", error instanceof Error ? error.stack : "No stack trace");
     console.error("Error details:", JSON.stringify(error, Object.getOwnPropertyNames(error)));
+    if (error instanceof LLMError) {
+      return NextResponse.json(
+        {
+          error: error.retryable
+            ? "The AI service is busy right now. Please try again in a moment."
+            : "The AI service could not process this request.",
+          details: error.message,
+        },
+        { status: error.retryable ? 503 : 502 }
+      );
+    }
     return NextResponse.json(
       { 
         error: "Internal server error", 
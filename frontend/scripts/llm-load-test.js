@@ -0,0 +1,50 @@
+// llm-load-test.js
+// Fires concurrent requests at /api/break-tasks and reports latency and
+// throughput. Run the app against the mock server (see mock-llm-server.js).
+const BASE_URL = process.env.APP_URL || "http://localhost:3000";
+const TOTAL = Number(process.env.LOAD_REQUESTS) || 200;
+const CONCURRENCY = Number(process.env.LOAD_CONCURRENCY) || 20;
+// A small pool of tasks, so some requests are duplicates of in-flight ones
+const TASKS = ["Clean my room", "Write the report", "Plan the trip", "Do the laundry", "Study for exam"];
+
+async function runOne(i) {
+  const start = performance.now();
+  const response = await fetch(`${BASE_URL}/api/break-tasks`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ userTask: TASKS[i % TASKS.length], adhdType: "combined" }),
+  });
+  await response.text();
+  return { status: response.status, ms: performance.now() - start };
+}
+
+async function main() {
+  const results = [];
+  let next = 0;
+  const start = performance.now();
+
+  async function worker() {
+    while (next < TOTAL) {
+      const i = next++;
+      try {
+        results.push(await runOne(i));
+      } catch (error) {
+        results.push({ status: "network-error", ms: 0 });
+      }
+    }
+  }
+
+  await Promise.all(Array.from({ length: CONCURRENCY }, worker));
+  const seconds = (performance.now() - start) / 1000;
+
+  const latencies = results.map((r) => r.ms).sort((a, b) => a - b);
+  const pct = (p) => latencies[Math.min(latencies.length - 1, Math.floor(latencies.length * p))].toFixed(0);
+  const statuses = results.reduce((acc, r) => ((acc[r.status] = (acc[r.status] || 0) + 1), acc), {});
+
+  console.log(`${TOTAL} requests, concurrency ${CONCURRENCY}, ${seconds.toFixed(1)}s`);
+  console.log(`throughput: ${(TOTAL / seconds).toFixed(1)} req/s`);
+  console.log(`latency p50: ${pct(0.5)}ms  p95: ${pct(0.95)}ms  p99: ${pct(0.99)}ms`);
+  console.log("status codes:", statuses);
+}
+
+main();
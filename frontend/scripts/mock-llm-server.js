@@ -0,0 +1,76 @@
+// mock-llm-server.js
+// Stand-in for the Gemini generateContent endpoint, for tests and load runs.
+// Start the app with GEMINI_BASE_URL=http://localhost:8787 to route the API
+// routes here instead of Google.
+const http = require("http");
+
+const PORT = Number(process.env.MOCK_LLM_PORT) || 8787;
+const LATENCY_MS = Number(process.env.MOCK_LLM_LATENCY_MS) || 300;
+const FAILURE_RATE = Number(process.env.MOCK_LLM_FAILURE_RATE) || 0; // 0..1, answered with 503
+
+let requests = 0;
+let failures = 0;
+
+function breakTasksReply(prompt) {
+  const task = (prompt.match(/User task: "(.*)"/) || [])[1] || "the task";
+  return JSON.stringify({
+    subtype: (prompt.match(/User ADHD subtype: (\w+)/) || [])[1] || "combined",
+    original_task: task,
+    subtasks: [
+      `Gather what you need for ${task}`,
+      `Spend 10 minutes starting ${task}`,
+      "Take a short break",
+      `Finish and review ${task}`,
+    ],
+    explanation: "Mock breakdown",
+  });
+}
+
+function classifyReply() {
+  return JSON.stringify({
+    subtype: "Combined",
+    persona: "The Adaptive Balancer",
+    reasoning: "Mock classification",
+    recommended_ui_features: ["focus timer", "task breakdown"],
+  });
+}
+
+const server = http.createServer((req, res) => {
+  if (req.method !== "POST" || !/:generateContent$/.test(req.url || "")) {
+    res.writeHead(404).end();
+    return;
+  }
+
+  let body = "";
+  req.on("data", (chunk) => (body += chunk));
+  req.on("end", () => {
+    requests += 1;
+    setTimeout(() => {
+      if (Math.random() < FAILURE_RATE) {
+        failures += 1;
+        res.writeHead(503, { "Content-Type": "application/json" });
+        res.end(JSON.stringify({ error: { code: 503, message: "Mock overload", status: "UNAVAILABLE" } }));
+        return;
+      }
+
+      const prompt = JSON.parse(body).contents?.[0]?.parts?.[0]?.text || "";
+      const text = prompt.includes("task structuring assistant")
+        ? breakTasksReply(prompt)
+        : classifyReply();
+
+      res.writeHead(200, { "Content-Type": "application/json" });
+      res.end(JSON.stringify({
+        candidates: [{ content: { role: "model", parts: [{ text }] }, finishReason: "STOP", index: 0 }],
+      }));
+    }, LATENCY_MS);
+  });
+});
+
+server.keepAliveTimeout = 60_000;
+server.listen(PORT, () => {
+  console.log(`Mock LLM listening on http://localhost:${PORT} (latency ${LATENCY_MS}ms, failure rate ${FAILURE_RATE})`);
+});
+
+setInterval(() => {
+  if (requests > 0) console.log(`requests: ${requests}, injected failures: ${failures}`);
+}, 5000).unref();
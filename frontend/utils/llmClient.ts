@@ -0,0 +1,251 @@
+import {
+  GoogleGenerativeAI,
+  GoogleGenerativeAIFetchError,
+  GoogleGenerativeAIRequestInputError,
+  GoogleGenerativeAIResponseError,
+  type GenerativeModel,
+} from "@google/generative-ai";
+
+const DEFAULT_MODEL = "gemini-2.5-flash";
+const REQUEST_TIMEOUT_MS = Number(process.env.LLM_TIMEOUT_MS) || 30_000;
+const MAX_RETRIES = 3;
+const BASE_RETRY_DELAY_MS = 500;
+const MAX_RETRY_DELAY_MS = 8_000;
+// Total time for one request across every attempt and backoff. The routes
+// export a matching `maxDuration`; keep this a few seconds under it so a
+// failure is still reported before the platform stops the function.
+const TOTAL_DEADLINE_MS = Number(process.env.LLM_DEADLINE_MS) || 25_000;
+const REQUESTS_PER_SECOND = Number(process.env.LLM_REQUESTS_PER_SECOND) || 5;
+const BURST_SIZE = Number(process.env.LLM_BURST_SIZE) || 10;
+const MAX_CONCURRENT_REQUESTS = Number(process.env.LLM_MAX_CONCURRENCY) || 8;
+// Point this at `npm run mock:llm` to test without calling Google
+const BASE_URL = process.env.GEMINI_BASE_URL || undefined;
+
+const RETRYABLE_STATUS = new Set([408, 429, 500, 502, 503, 504]);
+// Keys can come from request bodies, so only a few clients are kept around
+const MAX_CACHED_CLIENTS = 16;
+
+export class LLMError extends Error {
+  status?: number;
+  retryable: boolean;
+
+  constructor(message: string, retryable: boolean, status?: number) {
+    super(message);
+    this.name = "LLMError";
+    this.retryable = retryable;
+    this.status = status;
+  }
+}
+
+/**
+ * Token bucket shared by every request in this server process.
+ */
+class TokenBucket {
+  private tokens: number;
+  private lastRefill = Date.now();
+
+  constructor(private ratePerSecond: number, private capacity: number) {
+    this.tokens = capacity;
+  }
+
+  /**
+   * Wait for a token. Resolves false without taking one if none would be
+   * free before `deadline` (a `Date.now()` timestamp).
+   */
+  async take(deadline: number): Promise<boolean> {
+    for (;;) {
+      const now = Date.now();
+      this.tokens = Math.min(
+        this.capacity,
+        this.tokens + ((now - this.lastRefill) / 1000) * this.ratePerSecond
+      );
+      this.lastRefill = now;
+      if (this.tokens >= 1) {
+        this.tokens -= 1;
+        return true;
+      }
+      const wait = ((1 - this.tokens) / this.ratePerSecond) * 1000;
+      if (now + wait >= deadline) return false;
+      await sleep(wait);
+    }
+  }
+}
+
+/**
+ * Caps how many requests are waiting on the upstream API at once.
+ */
+class Semaphore {
+  private waiters: (() => void)[] = [];
+
+  constructor(private available: number) {}
+
+  /**
+   * Wait for a free slot. Resolves false without taking one if none frees
+   * up within `timeoutMs`.
+   */
+  async acquire(timeoutMs: number): Promise<boolean> {
+    if (this.available > 0) {
+      this.available -= 1;
+      return true;
+    }
+    if (timeoutMs <= 0) return false;
+    return new Promise<boolean>((resolve) => {
+      const waiter = () => {
+        clearTimeout(timer);
+        resolve(true);
+      };
+      const timer = setTimeout(() => {
+        this.waiters = this.waiters.filter((other) => other !== waiter);
+        resolve(false);
+      }, timeoutMs);
+      this.waiters.push(waiter);
+    });
+  }
+
+  release(): void {
+    const next = this.waiters.shift();
+    if (next) {
+      next();
+    } else {
+      this.available += 1;
+    }
+  }
+}
+
+const rateLimiter = new TokenBucket(REQUESTS_PER_SECOND, BURST_SIZE);
+const concurrency = new Semaphore(MAX_CONCURRENT_REQUESTS);
+
+// Recently used clients, least recently used first. Connection reuse does
+// not depend on this cache: Node's fetch keeps a pooled keep-alive
+// connection per origin for every client. The cache only saves rebuilding
+// clients for the server key and active users, and it is capped so keys sent
+// in request bodies are not held indefinitely.
+const models = new Map<string, GenerativeModel>();
+const inFlight = new Map<string, Promise<string>>();
+
+function getModel(apiKey: string, modelName: string): GenerativeModel {
+  const key = `${modelName}:${apiKey}`;
+  let model = models.get(key);
+  if (model) {
+    models.delete(key);
+  } else {
+    model = new GoogleGenerativeAI(apiKey).getGenerativeModel(
+      { model: modelName },
+      { timeout: REQUEST_TIMEOUT_MS, baseUrl: BASE_URL }
+    );
+    if (models.size >= MAX_CACHED_CLIENTS) {
+      models.delete(models.keys().next().value as string);
+    }
+  }
+  models.set(key, model);
+  return model;
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function toLLMError(error: unknown): LLMError {
+  if (error instanceof LLMError) return error;
+  if (error instanceof GoogleGenerativeAIFetchError) {
+    const retryable = error.status === undefined || RETRYABLE_STATUS.has(error.status);
+    return new LLMError(error.message, retryable, error.status);
+  }
+  if (
+    error instanceof GoogleGenerativeAIRequestInputError ||
+    error instanceof GoogleGenerativeAIResponseError
+  ) {
+    return new LLMError(error.message, false);
+  }
+  // Timeouts and dropped connections
+  const message = error instanceof Error ? error.message : String(error);
+  return new LLMError(message, true);
+}
+
+function deadlineExceeded(lastError?: LLMError): LLMError {
+  const detail = lastError ? `: ${lastError.message}` : "";
+  return new LLMError(`LLM request timed out after ${TOTAL_DEADLINE_MS} ms${detail}`, true, lastError?.status);
+}
+
+async function generateWithRetries(apiKey: string, modelName: string, prompt: string): Promise<string> {
+  const model = getModel(apiKey, modelName);
+  const deadline = Date.now() + TOTAL_DEADLINE_MS;
+  let lastError: LLMError | undefined;
+  for (let attempt = 0; ; attempt++) {
+    if (!(await rateLimiter.take(deadline)) || !(await concurrency.acquire(deadline - Date.now()))) {
+      throw deadlineExceeded(lastError);
+    }
+    // Each attempt only gets the time left before the deadline, including
+    // any time spent waiting for the rate limiter or a free slot
+    const remaining = deadline - Date.now();
+    if (remaining <= 0) {
+      concurrency.release();
+      throw deadlineExceeded(lastError);
+    }
+    try {
+      const response = await model.generateContent(prompt, {
+        timeout: Math.min(REQUEST_TIMEOUT_MS, remaining),
+      });
+      return response.response.text();
+    } catch (error) {
+      lastError = toLLMError(error);
+      if (!lastError.retryable || attempt >= MAX_RETRIES) {
+        throw lastError;
+      }
+    } finally {
+      concurrency.release();
+    }
+    // Full jitter keeps retries from synchronizing after an outage
+    const ceiling = Math.min(MAX_RETRY_DELAY_MS, BASE_RETRY_DELAY_MS * 2 ** attempt);
+    const delay = Math.random() * ceiling;
+    if (Date.now() + delay >= deadline) {
+      throw deadlineExceeded(lastError);
+    }
+    console.warn(`LLM request failed (attempt ${attempt + 1}), retrying:`, lastError.message);
+    await sleep(delay);
+  }
+}
+
+/**
+ * Generate text for a prompt through the shared client.
+ *
+ * Identical requests that arrive while one is already in flight share its
+ * result instead of calling the API again.
+ */
+export function generateText(
+  apiKey: string,
+  prompt: string,
+  modelName: string = DEFAULT_MODEL
+): Promise<string> {
+  const key = `${modelName}\u0000${apiKey}\u0000${prompt}`;
+  const existing = inFlight.get(key);
+  if (existing) return existing;
+
+  const request = generateWithRetries(apiKey, modelName, prompt).finally(() => {
+    inFlight.delete(key);
+  });
+  inFlight.set(key, request);
+  return request;
+}
+
+export type PromptTemplate = {
+  render: (values: Record<string, string | number>) => string;
+};
+
+/**
+ * Compile a prompt with `{{name}}` placeholders. Call this once at module
+ * scope; rendering only joins the pre-split static parts with the values.
+ */
+export function promptTemplate(text: string): PromptTemplate {
+  // Even indexes are static text, odd indexes are placeholder names
+  const parts = text.split(/\{\{(\w+)\}\}/);
+  return {
+    render(values) {
+      let output = parts[0];
+      for (let i = 1; i < parts.length; i += 2) {
+        output += String(values[parts[i]] ?? "") + parts[i + 1];
+      }
+      return output;
+    },
+  };
+}
@@ -0,0 +1,251 @@
+"""Event-sourced XP ledger for the desktop app.
+
+Mirrors the rules in ``frontend/utils/gamification.ts``. Every XP change is
+recorded as an event, and the values the UI shows (total XP, level, tasks
+completed today, day streak) are kept as running aggregates that each event
+updates in O(1), so reading stats never rescans the history.
+"""
+import json
+import os
+import tempfile
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+XP_PER_TASK = 5
+XP_FOR_BREAKING_TASK = 10
+XP_FOR_FOCUS_MODE = 10
+XP_FOR_TASK_LIST_COMPLETION = 10
+XP_FOR_LEVEL_1 = 50
+XP_PER_LEVEL = 100
+
+TASK_COMPLETED = "task_completed"
+TASK_UNCOMPLETED = "task_uncompleted"
+TASK_DELETED = "task_deleted"
+TASK_BROKEN_DOWN = "task_broken_down"
+FOCUS_SESSION = "focus_session"
+TASK_LIST_COMPLETED = "task_list_completed"
+
+EVENT_XP = {
+    TASK_COMPLETED: XP_PER_TASK,
+    TASK_UNCOMPLETED: -XP_PER_TASK,
+    TASK_DELETED: -XP_PER_TASK,
+    TASK_BROKEN_DOWN: XP_FOR_BREAKING_TASK,
+    FOCUS_SESSION: XP_FOR_FOCUS_MODE,
+    TASK_LIST_COMPLETED: XP_FOR_TASK_LIST_COMPLETION,
+}
+
+XPEvent = namedtuple("XPEvent", ["kind", "timestamp"])
+
+
+def calculate_level(xp):
+    """Return ``(level, current_level_xp, xp_to_next_level)`` for a total."""
+    if xp < XP_FOR_LEVEL_1:
+        return 1, xp, XP_FOR_LEVEL_1 - xp
+    xp_after_level_1 = xp - XP_FOR_LEVEL_1
+    level = 2 + xp_after_level_1 // XP_PER_LEVEL
+    current_level_xp = xp_after_level_1 % XP_PER_LEVEL
+    return level, current_level_xp, XP_PER_LEVEL - current_level_xp
+
+
+class XPLedger:
+    def __init__(self):
+        self.events = []
+        self._reset()
+
+    def _reset(self):
+        self.total_xp = 0
+        self.tasks_completed = 0
+        self.last_completion_day = None
+        self.completed_on_last_day = 0
+        self.streak_days = 0
+        # (day, count, streak) before the last completion day started, so
+        # revoking that day's only completion can restore it
+        self._previous_day = (None, 0, 0)
+        self.level, self.current_level_xp, self.xp_to_next_level = calculate_level(0)
+
+    # Recording
+
+    def record(self, kind, timestamp=None):
+        if kind not in EVENT_XP:
+            raise ValueError(f"Unknown XP event: {kind}")
+        event = XPEvent(kind, timestamp or datetime.now())
+        self.replay([event])
+        return event
+
+    def record_task_completed(self, timestamp=None):
+        return self.record(TASK_COMPLETED, timestamp)
+
+    def record_task_uncompleted(self, timestamp=None):
+        return self.record(TASK_UNCOMPLETED, timestamp)
+
+    def record_task_deleted(self, timestamp=None):
+        return self.record(TASK_DELETED, timestamp)
+
+    def record_break_down(self, timestamp=None):
+        return self.record(TASK_BROKEN_DOWN, timestamp)
+
+    def record_focus_session(self, timestamp=None):
+        return self.record(FOCUS_SESSION, timestamp)
+
+    def record_task_list_completed(self, timestamp=None):
+        return self.record(TASK_LIST_COMPLETED, timestamp)
+
+    def replay(self, events):
+        """Apply a batch of historical events in one chronological pass.
+
+        A batch that starts after the newest recorded event is applied on top
+        of the current aggregates. One that reaches back into the recorded
+        history is merged into it and the aggregates are rebuilt in order.
+        """
+        batch = sorted(events, key=lambda event: event.timestamp)
+        if not batch:
+            return
+        if self.events and batch[0].timestamp < self.events[-1].timestamp:
+            self.events = sorted(self.events + batch, key=lambda event: event.timestamp)
+            self._rebuild()
+            return
+        for event in batch:
+            self._apply(event)
+        self.events.extend(batch)
+
+    def _rebuild(self):
+        self._reset()
+        for event in self.events:
+            self._apply(event)
+
+    def _apply(self, event):
+        self.total_xp = max(0, self.total_xp + EVENT_XP[event.kind])
+        self.level, self.current_level_xp, self.xp_to_next_level = calculate_level(self.total_xp)
+
+        day = event.timestamp.date()
+        if event.kind == TASK_COMPLETED:
+            self.tasks_completed += 1
+            if day == self.last_completion_day:
+                self.completed_on_last_day += 1
+            else:
+                self._previous_day = (
+                    self.last_completion_day, self.completed_on_last_day, self.streak_days
+                )
+                if (self.last_completion_day is not None
+                        and day - self.last_completion_day == timedelta(days=1)):
+                    self.streak_days += 1
+                else:
+                    self.streak_days = 1
+                self.last_completion_day = day
+                self.completed_on_last_day = 1
+        elif event.kind == TASK_UNCOMPLETED:
+            self.tasks_completed = max(0, self.tasks_completed - 1)
+            if day == self.last_completion_day and self.completed_on_last_day > 0:
+                self.completed_on_last_day -= 1
+                if self.completed_on_last_day == 0:
+                    (self.last_completion_day, self.completed_on_last_day,
+                     self.streak_days) = self._previous_day
+
+    # Reading
+
+    def tasks_completed_today(self, today=None):
+        today = today or datetime.now().date()
+        return self.completed_on_last_day if self.last_completion_day == today else 0
+
+    def streak(self, today=None):
+        """Consecutive days with a completed task, ending today or yesterday."""
+        today = today or datetime.now().date()
+        if self.last_completion_day is None:
+            return 0
+        if today - self.last_completion_day > timedelta(days=1):
+            return 0
+        return self.streak_days
+
+    def progress_percentage(self):
+        needed = XP_FOR_LEVEL_1 if self.level == 1 else XP_PER_LEVEL
+        return (needed - self.xp_to_next_level) * 100 / needed
+
+    def stats(self, today=None):
+        return {
+            "totalXP": self.total_xp,
+            "level": self.level,
+            "currentLevelXP": self.current_level_xp,
+            "xpToNextLevel": self.xp_to_next_level,
+            "tasksCompleted": self.tasks_completed,
+            "tasksCompletedToday": self.tasks_completed_today(today),
+            "streak": self.streak(today),
+        }
+
+    # Persistence
+    #
+    # The ledger is stored as JSON Lines, one event per line, so recording an
+    # event appends a single line instead of rewriting the whole history.
+
+    def to_jsonl(self):
+        return "".join(event_line(event) for event in self.events)
+
+    @classmethod
+    def from_jsonl(cls, data):
+        lines = data.splitlines(keepends=True)
+        if lines and not lines[-1].endswith("\n"):
+            # An append that was cut off leaves a partial last line; only
+            # that event is lost
+            try:
+                parse_event(lines[-1])
+            except (ValueError, KeyError, TypeError):
+                lines.pop()
+        ledger = cls()
+        ledger.replay([parse_event(line) for line in lines if line.strip()])
+        return ledger
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved ledger, or start an empty one if there is none yet.
+
+        Returns ``(ledger, discarded_path)``. A ledger that cannot be read is
+        moved aside to ``discarded_path`` and an empty one is returned in its
+        place; ``discarded_path`` is None otherwise.
+        """
+        if not os.path.exists(path):
+            return cls(), None
+        try:
+            with open(path) as f:
+                return cls.from_jsonl(f.read()), None
+        except (OSError, ValueError, KeyError, TypeError):
+            discarded_path = f"{path}.corrupt-{datetime.now():%Y%m%d-%H%M%S}"
+            try:
+                os.replace(path, discarded_path)
+            except OSError:
+                discarded_path = None
+            return cls(), discarded_path
+
+    def save(self, path):
+        write_atomic(path, self.to_jsonl())
+
+
+def event_line(event):
+    return json.dumps([event.kind, event.timestamp.isoformat()]) + "\n"
+
+
+def parse_event(line):
+    kind, timestamp = json.loads(line)
+    if kind not in EVENT_XP:
+        raise KeyError(f"Unknown XP event: {kind}")
+    return XPEvent(kind, datetime.fromisoformat(timestamp))
+
+
+def append_event(path, event):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(event_line(event))
+
+
+def write_atomic(path, data):
+    # Write to a temporary file first so a crash never leaves half a ledger.
+    # Each write gets its own temporary file, so two writers can never
+    # replace or remove each other's.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
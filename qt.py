@@ -1,27 +1,167 @@
 import sys
+import os
+import math
+import time
+import asyncio
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
+import qasync
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from gamification import (
+    XPLedger, append_event, XP_PER_TASK, TASK_COMPLETED, TASK_UNCOMPLETED, TASK_DELETED,
+    TASK_BROKEN_DOWN, FOCUS_SESSION,
+)
 
 class Task:
-    def __init__(self, title, duration=30):
+    """A task or subtask node.
+
+    Steps are child ``Task`` objects and may nest to any depth. Progress is
+    rolled up from the leaves: every node keeps the number of leaves below it
+    and how many of those are done, and a change only walks the parent chain,
+    so updates cost O(depth) rather than a rescan of the whole tree.
+    """
+
+    def __init__(self, title, duration=30, parent=None):
         self.id = datetime.now().timestamp()
         self.title = title
-        self.completed = False
-        self.progress = 0
         self.duration = duration
+        self.parent = parent
         self.steps = []
         self.created = datetime.now()
         self.time_spent = 0
+        # A leaf counts itself; these are adjusted incrementally afterwards
+        self.leaf_count = 1
+        self.done_count = 0
+
+    @property
+    def completed(self):
+        return self.done_count == self.leaf_count
+
+    @property
+    def progress(self):
+        return int(self.done_count * 100 / self.leaf_count)
+
+    def add_step(self, title, duration=None):
+        step = Task(title, duration if duration is not None else self.duration, parent=self)
+        if self.steps:
+            leaf_delta, done_delta = 1, 0
+        else:
+            # This node stops being a leaf; the new step replaces it
+            leaf_delta, done_delta = 0, -self.done_count
+        self.steps.append(step)
+        self._propagate(leaf_delta, done_delta)
+        return step
+
+    def set_completed(self, completed):
+        """Mark this node (and everything under it) done or not done."""
+        target = self.leaf_count if completed else 0
+        delta = target - self.done_count
+        if delta == 0:
+            return
+        self._mark_subtree(completed)
+        node = self.parent
+        while node is not None:
+            node.done_count += delta
+            node = node.parent
+
+    def _mark_subtree(self, completed):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node.done_count = node.leaf_count if completed else 0
+            stack.extend(node.steps)
+
+    def _propagate(self, leaf_delta, done_delta):
+        node = self
+        while node is not None:
+            node.leaf_count += leaf_delta
+            node.done_count += done_delta
+            node = node.parent
+
+class BackgroundTasks:
+    """Coroutines running on the shared asyncio + Qt event loop.
+
+    Anything that waits on I/O should be written as a coroutine and started
+    with ``spawn`` so the UI thread keeps handling events meanwhile. At most
+    ``max_concurrency`` jobs run at once, ``max_pending`` bounds the queue
+    behind them, and every job gets a timeout.
+    """
+
+    def __init__(self, max_concurrency=4, max_pending=32, default_timeout=30):
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.tasks = set()
+
+    def spawn(self, coro, timeout=None, on_done=None, on_error=None):
+        if len(self.tasks) >= self.max_pending:
+            coro.close()
+            raise asyncio.QueueFull("Too many background jobs pending")
+        task = asyncio.ensure_future(self._run(coro, timeout or self.default_timeout))
+        self.tasks.add(task)
+
+        def finished(task):
+            self.tasks.discard(task)
+            if task.cancelled():
+                return
+            error = task.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(task.result())
+
+        task.add_done_callback(finished)
+        return task
+
+    async def _run(self, coro, timeout):
+        async with self.semaphore:
+            return await asyncio.wait_for(coro, timeout)
+
+    def cancel_all(self):
+        for task in list(self.tasks):
+            task.cancel()
+
+def ask_text(parent, title, label, on_text):
+    """Prompt for a line of text without blocking the event loop."""
+    dialog = QInputDialog(parent)
+    dialog.setWindowTitle(title)
+    dialog.setLabelText(label)
+    dialog.setAttribute(Qt.WA_DeleteOnClose)
+    dialog.textValueSelected.connect(lambda text: text and on_text(text))
+    dialog.open()
+
+async def monitor_loop_latency(interval=0.05, window=200):
+    """Print the 95th-percentile UI stall every ``window`` samples.
+
+    Measures how late a short sleep wakes up, which includes time spent in
+    Qt handlers as well as coroutine steps. Enabled with ADHD_LOOP_STATS=1.
+    """
+    samples = []
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+        if len(samples) >= window:
+            samples.sort()
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            print(f"[loop] p95 handler delay: {p95:.1f} ms (max {samples[-1]:.1f} ms)",
+                  file=sys.stderr)
+            samples.clear()
 
 class PomodoroTimer(QWidget):
+    session_completed = pyqtSignal()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.time_left = 25 * 60
         self.duration = 25 * 60
         self.is_running = False
+        self.low_power = False
+        self.deadline = 0
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_timer)
         self.init_ui()
@@ -141,13 +281,15 @@ class PomodoroTimer(QWidget):
     
     def start_timer(self):
         self.is_running = True
-        self.timer.start(1000)
+        self.deadline = time.monotonic() + self.time_left
+        self.schedule_tick()
         self.start_btn.setText("Pause")
         self.start_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
     
     def pause_timer(self):
         self.is_running = False
         self.timer.stop()
+        self.time_left = self.remaining()
         self.start_btn.setText("Resume")
         self.start_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
     
@@ -160,15 +302,40 @@ class PomodoroTimer(QWidget):
         self.start_btn.setText("Start Focus")
         self.start_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
     
+    def remaining(self):
+        return max(0, math.ceil(self.deadline - time.monotonic()))
+    
+    def schedule_tick(self):
+        if self.low_power:
+            # Only wake up when the minute shown on screen changes
+            self.timer.setTimerType(Qt.VeryCoarseTimer)
+            self.timer.start(((self.time_left - 1) % 60 + 1) * 1000)
+        else:
+            self.timer.setTimerType(Qt.CoarseTimer)
+            self.timer.start(1000)
+    
+    def set_low_power(self, enabled):
+        self.low_power = enabled
+        if self.is_running:
+            self.time_left = self.remaining()
+            self.schedule_tick()
+        self.update_display()
+    
     def update_timer(self):
-        self.time_left -= 1
+        self.time_left = self.remaining()
         if self.time_left <= 0:
             self.timer_completed()
+            return
         self.update_display()
         progress = ((self.duration - self.time_left) / self.duration) * 100
         self.progress_bar.setValue(int(progress))
+        if self.low_power:
+            self.schedule_tick()
     
     def update_display(self):
+        if self.low_power:
+            self.time_label.setText(f"{math.ceil(self.time_left / 60)} min")
+            return
         minutes = self.time_left // 60
         seconds = self.time_left % 60
         self.time_label.setText(f"{minutes:02d}:{seconds:02d}")
@@ -179,8 +346,12 @@ class PomodoroTimer(QWidget):
         self.time_left = 0
         self.update_display()
         self.progress_bar.setValue(100)
-        QMessageBox.information(self, "Focus Complete!", 
-            "🎉 Great job! You completed a focus session!\nTime for a break!")
+        self.session_completed.emit()
+        msg = QMessageBox(QMessageBox.Information, "Focus Complete!",
+            "🎉 Great job! You completed a focus session!\nTime for a break!",
+            QMessageBox.Ok, self)
+        msg.setAttribute(Qt.WA_DeleteOnClose)
+        msg.open()
         self.reset_timer()
     
     def change_duration(self, index):
@@ -188,14 +359,147 @@ class PomodoroTimer(QWidget):
         self.duration = durations[index] * 60
         self.reset_timer()
 
+class StepItem(QWidget):
+    """One row of the subtask tree.
+
+    Child rows are only created the first time the row is expanded, so a
+    deeply broken-down task costs a single widget per visible step.
+    """
+    changed = pyqtSignal()
+    
+    def __init__(self, step, parent=None):
+        super().__init__(parent)
+        self.step = step
+        self.expanded = False
+        self.children_list = None
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        
+        header_layout = QHBoxLayout()
+        header_layout.setSpacing(6)
+        
+        self.expand_btn = QPushButton()
+        self.expand_btn.setFlat(True)
+        self.expand_btn.setFixedSize(20, 20)
+        self.expand_btn.clicked.connect(self.toggle_expand)
+        
+        self.checkbox = QCheckBox()
+        self.checkbox.clicked.connect(self.on_checkbox_clicked)
+        
+        self.title_label = QLabel(self.step.title)
+        self.title_label.setWordWrap(True)
+        
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet("color: #757575; font-size: 11px;")
+        
+        add_btn = QPushButton("+")
+        add_btn.setFlat(True)
+        add_btn.setFixedSize(20, 20)
+        add_btn.setToolTip("Add sub-step")
+        add_btn.clicked.connect(self.add_step)
+        
+        header_layout.addWidget(self.expand_btn)
+        header_layout.addWidget(self.checkbox)
+        header_layout.addWidget(self.title_label, 1)
+        header_layout.addWidget(self.count_label)
+        header_layout.addWidget(add_btn)
+        
+        layout.addLayout(header_layout)
+        self.main_layout = layout
+        self.setLayout(layout)
+        self.refresh()
+    
+    def toggle_expand(self):
+        self.expanded = not self.expanded
+        if self.expanded and self.children_list is None:
+            self.children_list = StepList(self.step, indent=20)
+            self.children_list.changed.connect(self.on_child_changed)
+            self.main_layout.addWidget(self.children_list)
+        if self.children_list is not None:
+            self.children_list.setVisible(self.expanded)
+        self.refresh()
+    
+    def add_step(self):
+        ask_text(self, "Add Sub-step", "Enter sub-step description:", self.add_step_text)
+    
+    def add_step_text(self, text):
+        step = self.step.add_step(text)
+        if self.children_list is not None:
+            self.children_list.append(step)
+        if not self.expanded:
+            self.toggle_expand()
+        self.on_child_changed()
+    
+    def on_checkbox_clicked(self, checked):
+        self.step.set_completed(checked)
+        if self.children_list is not None:
+            self.children_list.refresh()
+        self.refresh()
+        self.changed.emit()
+    
+    def on_child_changed(self):
+        self.refresh()
+        self.changed.emit()
+    
+    def refresh(self):
+        self.checkbox.setChecked(self.step.completed)
+        color = "#999" if self.step.completed else "#2c3e50"
+        decoration = "line-through" if self.step.completed else "none"
+        self.title_label.setStyleSheet(
+            f"font-size: 13px; color: {color}; text-decoration: {decoration};"
+        )
+        has_steps = bool(self.step.steps)
+        self.count_label.setVisible(has_steps)
+        self.expand_btn.setVisible(has_steps)
+        if has_steps:
+            self.count_label.setText(f"{self.step.done_count}/{self.step.leaf_count}")
+            arrow = QStyle.SP_ArrowDown if self.expanded else QStyle.SP_ArrowRight
+            self.expand_btn.setIcon(self.style().standardIcon(arrow))
+
+class StepList(QWidget):
+    """Rows for the direct steps of one task node."""
+    changed = pyqtSignal()
+    
+    def __init__(self, node, indent=0, parent=None):
+        super().__init__(parent)
+        self.node = node
+        self.items = []
+        self.list_layout = QVBoxLayout()
+        self.list_layout.setContentsMargins(indent, 0, 0, 0)
+        self.list_layout.setSpacing(4)
+        self.setLayout(self.list_layout)
+        for step in node.steps:
+            self.append(step)
+    
+    def append(self, step):
+        item = StepItem(step)
+        item.changed.connect(self.changed)
+        self.items.append(item)
+        self.list_layout.addWidget(item)
+    
+    def refresh(self):
+        # Only rows that have been built need syncing; the rest read the
+        # model when they are first expanded
+        for item in self.items:
+            item.refresh()
+            if item.children_list is not None:
+                item.children_list.refresh()
+
 class TaskCard(QWidget):
     task_completed = pyqtSignal(object)
     task_deleted = pyqtSignal(object)
+    task_broken_down = pyqtSignal(object)
+    task_uncompleted = pyqtSignal(object)
     
     def __init__(self, task, parent=None):
         super().__init__(parent)
         self.task = task
         self.expanded = False
+        self.completion_emitted = False
         self.init_ui()
     
     def init_ui(self):
@@ -279,12 +583,26 @@ class TaskCard(QWidget):
         time_layout.addWidget(self.time_label)
         time_layout.addStretch()
         
-        # Expandable section
+        # Expandable section, built on first expand
+        self.details_widget = None
+        self.step_list = None
+        
+        main_layout.addLayout(header_layout)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addLayout(time_layout)
+        
+        self.main_layout = main_layout
+        self.setLayout(main_layout)
+        self.refresh_progress()
+    
+    def build_details(self):
         self.details_widget = QWidget()
-        self.details_widget.hide()
         details_layout = QVBoxLayout()
         details_layout.setContentsMargins(0, 10, 0, 0)
         
+        self.step_list = StepList(self.task)
+        self.step_list.changed.connect(self.refresh_progress)
+        
         # Add steps button
         add_step_btn = QPushButton("+ Add Step")
         add_step_btn.setStyleSheet("""
@@ -303,52 +621,442 @@ class TaskCard(QWidget):
         """)
         add_step_btn.clicked.connect(self.add_step)
         
+        details_layout.addWidget(self.step_list)
         details_layout.addWidget(add_step_btn)
         self.details_widget.setLayout(details_layout)
-        
-        main_layout.addLayout(header_layout)
-        main_layout.addWidget(self.progress_bar)
-        main_layout.addLayout(time_layout)
-        main_layout.addWidget(self.details_widget)
-        
-        self.setLayout(main_layout)
+        self.main_layout.addWidget(self.details_widget)
     
     def toggle_expand(self):
         self.expanded = not self.expanded
         if self.expanded:
+            if self.details_widget is None:
+                self.build_details()
             self.details_widget.show()
             self.expand_btn.setIcon(self.style().standardIcon(QStyle.SP_ArrowUp))
         else:
             self.details_widget.hide()
             self.expand_btn.setIcon(self.style().standardIcon(QStyle.SP_ArrowDown))
     
+    def release_details(self):
+        """Collapse and drop the step widgets; they are rebuilt on expand."""
+        if self.expanded:
+            self.toggle_expand()
+        if self.details_widget is not None:
+            self.details_widget.deleteLater()
+            self.details_widget = None
+            self.step_list = None
+    
     def add_step(self):
-        text, ok = QInputDialog.getText(self, "Add Step", "Enter step description:")
-        if ok and text:
-            self.task.steps.append({"text": text, "completed": False})
-            # Refresh display
+        ask_text(self, "Add Step", "Enter step description:", self.add_step_text)
     
-    def on_checkbox_changed(self, state):
-        if state == Qt.Checked:
-            self.task.completed = True
-            self.task.progress = 100
-            self.progress_bar.setValue(100)
+    def add_step_text(self, text):
+        step = self.task.add_step(text)
+        if self.step_list is not None:
+            self.step_list.append(step)
+        self.refresh_progress()
+        if len(self.task.steps) == 1:
+            self.task_broken_down.emit(self.task)
+    
+    def refresh_progress(self):
+        self.progress_bar.setValue(self.task.progress)
+        if self.task.steps:
+            self.time_label.setText(
+                f"⏱️ {self.task.duration} min  •  "
+                f"{self.task.done_count}/{self.task.leaf_count} steps"
+            )
+        else:
+            self.time_label.setText(f"⏱️ {self.task.duration} min")
+        # Finishing the last step completes the task itself, and reopening
+        # a step reopens it
+        if self.task.steps and self.task.completed != self.checkbox.isChecked():
+            self.checkbox.setChecked(self.task.completed)
+    
+    def update_title_style(self):
+        if self.checkbox.isChecked():
             self.title_label.setStyleSheet("""
                 font-size: 16px;
                 font-weight: 600;
                 color: #999;
                 text-decoration: line-through;
             """)
-            QTimer.singleShot(500, lambda: self.task_completed.emit(self.task))
+        else:
+            self.title_label.setStyleSheet("""
+                font-size: 16px;
+                font-weight: 600;
+                color: #2c3e50;
+            """)
+    
+    def on_checkbox_changed(self, state):
+        if state == Qt.Checked:
+            self.task.set_completed(True)
+            if self.step_list is not None:
+                self.step_list.refresh()
+            self.refresh_progress()
+            self.update_title_style()
+            QTimer.singleShot(500, self.emit_completed)
+        else:
+            if self.task.completed:
+                self.task.set_completed(False)
+                if self.step_list is not None:
+                    self.step_list.refresh()
+            self.refresh_progress()
+            self.update_title_style()
+            if self.completion_emitted:
+                self.completion_emitted = False
+                self.task_uncompleted.emit(self.task)
+    
+    def emit_completed(self):
+        # Skipped if the task was reopened before the delay ran out
+        if self.task.completed and not self.completion_emitted:
+            self.completion_emitted = True
+            self.task_completed.emit(self.task)
+
+class BreathingCircle(QWidget):
+    """Circle that grows and shrinks with the breath."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scale = 0.0
+        self.color = QColor("#4CAF50")
+        self.setFixedSize(220, 220)
+    
+    def set_state(self, scale, color):
+        if scale != self.scale or color != self.color:
+            self.scale = scale
+            self.color = color
+            self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        
+        center = QPointF(self.width() / 2, self.height() / 2)
+        outer = min(self.width(), self.height()) / 2 - 4
+        painter.setBrush(QColor("#e8f5e9"))
+        painter.drawEllipse(center, outer, outer)
+        
+        radius = outer * (0.35 + 0.65 * self.scale)
+        painter.setBrush(self.color)
+        painter.drawEllipse(center, radius, radius)
+
+class CalmDownDialog(QDialog):
+    """Guided box breathing and 5-4-3-2-1 grounding.
+
+    All motion comes from QVariantAnimation, which Qt drives from its single
+    shared animation timer, so the exercise adds no timers of its own and
+    only the breathing circle repaints each frame.
+    """
+    BREATH_PHASES = [
+        ("Breathe in", "#4CAF50"),
+        ("Hold", "#2196F3"),
+        ("Breathe out", "#FF9800"),
+        ("Hold", "#9C27B0"),
+    ]
+    PHASE_SECONDS = 4
+    BREATH_ROUNDS = 4
+    GROUNDING_STEPS = [
+        "👀 Name 5 things you can see",
+        "✋ Name 4 things you can touch",
+        "👂 Name 3 things you can hear",
+        "👃 Name 2 things you can smell",
+        "👅 Name 1 thing you can taste",
+    ]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Calm Down Exercises")
+        self.setModal(True)
+        self.setMinimumSize(500, 480)
+        
+        self.phase = None
+        self.count = None
+        self.grounding_step = 0
+        self.text_swapped = False
+        self.ease = QEasingCurve(QEasingCurve.InOutSine)
+        self.phase_colors = [QColor(color) for _, color in self.BREATH_PHASES]
+        
+        # One pass of the animation is one full breath (in, hold, out, hold)
+        self.breath_clock = QVariantAnimation(self)
+        self.breath_clock.setStartValue(0.0)
+        self.breath_clock.setEndValue(1.0)
+        self.breath_clock.setDuration(len(self.BREATH_PHASES) * self.PHASE_SECONDS * 1000)
+        self.breath_clock.setLoopCount(self.BREATH_ROUNDS)
+        self.breath_clock.valueChanged.connect(self.on_breath_frame)
+        self.breath_clock.finished.connect(self.on_breathing_finished)
+        
+        # Fades the grounding prompt out, swaps the text, and fades it back in
+        self.grounding_fade = QVariantAnimation(self)
+        self.grounding_fade.setStartValue(0.0)
+        self.grounding_fade.setEndValue(1.0)
+        self.grounding_fade.setDuration(500)
+        self.grounding_fade.valueChanged.connect(self.on_grounding_frame)
+        self.grounding_fade.finished.connect(lambda: self.grounding_opacity.setEnabled(False))
+        
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        title = QLabel("🧘 Take a Moment to Breathe")
+        title.setAlignment(Qt.AlignCenter)
+        title.setStyleSheet("font-size: 20px; font-weight: bold; padding: 20px;")
+        
+        # Exercise switcher
+        switch_layout = QHBoxLayout()
+        self.breathing_btn = QPushButton("🌬️ Box Breathing")
+        self.grounding_btn = QPushButton("🧠 5-4-3-2-1 Grounding")
+        for index, btn in enumerate((self.breathing_btn, self.grounding_btn)):
+            btn.setCheckable(True)
+            btn.setAutoExclusive(True)
+            btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #f0f0f0;
+                    border: none;
+                    border-radius: 8px;
+                    padding: 10px;
+                    font-size: 14px;
+                    color: #555;
+                }
+                QPushButton:checked {
+                    background-color: #4CAF50;
+                    color: white;
+                    font-weight: bold;
+                }
+            """)
+            btn.clicked.connect(lambda checked, index=index: self.show_exercise(index))
+            switch_layout.addWidget(btn)
+        
+        self.pages = QStackedWidget()
+        self.pages.addWidget(self.create_breathing_page())
+        self.pages.addWidget(self.create_grounding_page())
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        close_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 12px 24px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+        """)
+        
+        layout.addWidget(title)
+        layout.addLayout(switch_layout)
+        layout.addWidget(self.pages, 1)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+    
+    def create_breathing_page(self):
+        page = QWidget()
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignCenter)
+        
+        self.circle = BreathingCircle()
+        
+        self.phase_label = QLabel()
+        self.phase_label.setAlignment(Qt.AlignCenter)
+        self.phase_label.setStyleSheet("font-size: 22px; font-weight: bold; color: #2c3e50;")
+        
+        self.round_label = QLabel()
+        self.round_label.setAlignment(Qt.AlignCenter)
+        self.round_label.setStyleSheet("font-size: 13px; color: #757575;")
+        
+        self.breath_btn = QPushButton()
+        self.breath_btn.clicked.connect(self.toggle_breathing)
+        self.breath_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-size: 14px;
+            }
+        """)
+        
+        layout.addWidget(self.circle, 0, Qt.AlignCenter)
+        layout.addWidget(self.phase_label)
+        layout.addWidget(self.round_label)
+        layout.addWidget(self.breath_btn, 0, Qt.AlignCenter)
+        page.setLayout(layout)
+        return page
+    
+    def create_grounding_page(self):
+        page = QWidget()
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignCenter)
+        
+        self.grounding_label = QLabel()
+        self.grounding_label.setAlignment(Qt.AlignCenter)
+        self.grounding_label.setWordWrap(True)
+        self.grounding_label.setStyleSheet("""
+            font-size: 18px;
+            padding: 30px;
+            background-color: #f0f8ff;
+            border-radius: 10px;
+        """)
+        # Only enabled while fading, so the label normally paints directly
+        self.grounding_opacity = QGraphicsOpacityEffect(self.grounding_label)
+        self.grounding_opacity.setEnabled(False)
+        self.grounding_label.setGraphicsEffect(self.grounding_opacity)
+        
+        self.grounding_progress = QLabel()
+        self.grounding_progress.setAlignment(Qt.AlignCenter)
+        self.grounding_progress.setStyleSheet("font-size: 13px; color: #757575;")
+        
+        self.next_btn = QPushButton("Next")
+        self.next_btn.clicked.connect(self.next_grounding_step)
+        self.next_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-size: 14px;
+            }
+        """)
+        
+        layout.addWidget(self.grounding_label)
+        layout.addWidget(self.grounding_progress)
+        layout.addWidget(self.next_btn, 0, Qt.AlignCenter)
+        page.setLayout(layout)
+        return page
+    
+    def reset(self):
+        self.stop_animations()
+        self.grounding_step = 0
+        self.show_grounding_step()
+        self.show_breathing_idle()
+        self.breathing_btn.setChecked(True)
+        self.pages.setCurrentIndex(0)
+    
+    def show_exercise(self, index):
+        self.stop_animations()
+        self.pages.setCurrentIndex(index)
+        if index == 0:
+            self.show_breathing_idle()
+    
+    def stop_animations(self):
+        self.breath_clock.stop()
+        self.grounding_fade.stop()
+        self.grounding_opacity.setOpacity(1.0)
+        self.grounding_opacity.setEnabled(False)
+    
+    # Box breathing
+    
+    def toggle_breathing(self):
+        if self.breath_clock.state() == QAbstractAnimation.Running:
+            self.breath_clock.stop()
+            self.show_breathing_idle()
+        else:
+            self.phase = None
+            self.count = None
+            self.breath_btn.setText("Stop")
+            self.breath_clock.start()
+    
+    def show_breathing_idle(self):
+        self.circle.set_state(0.0, self.phase_colors[0])
+        self.phase_label.setText("Ready when you are")
+        self.round_label.setText(
+            f"{self.BREATH_ROUNDS} rounds of {self.PHASE_SECONDS}-count breathing"
+        )
+        self.breath_btn.setText("Start")
+    
+    def on_breath_frame(self, value):
+        position = value * len(self.BREATH_PHASES)
+        phase = min(int(position), len(self.BREATH_PHASES) - 1)
+        t = position - phase
+        
+        if phase == 0:
+            scale = self.ease.valueForProgress(t)
+        elif phase == 2:
+            scale = 1.0 - self.ease.valueForProgress(t)
+        else:
+            scale = 1.0 if phase == 1 else 0.0
+        self.circle.set_state(scale, self.phase_colors[phase])
+        
+        # Text only changes once per count, not every frame
+        count = self.PHASE_SECONDS - min(int(t * self.PHASE_SECONDS), self.PHASE_SECONDS - 1)
+        if phase != self.phase or count != self.count:
+            self.phase = phase
+            self.count = count
+            self.phase_label.setText(f"{self.BREATH_PHASES[phase][0]}… {count}")
+            self.round_label.setText(
+                f"Round {self.breath_clock.currentLoop() + 1} of {self.BREATH_ROUNDS}"
+            )
+    
+    def on_breathing_finished(self):
+        self.circle.set_state(0.0, self.phase_colors[0])
+        self.phase_label.setText("🌿 Well done")
+        self.round_label.setText("Notice how you feel now")
+        self.breath_btn.setText("Again")
+    
+    # 5-4-3-2-1 grounding
+    
+    def show_grounding_step(self):
+        if self.grounding_step < len(self.GROUNDING_STEPS):
+            self.grounding_label.setText(self.GROUNDING_STEPS[self.grounding_step])
+            self.grounding_progress.setText(
+                f"Step {self.grounding_step + 1} of {len(self.GROUNDING_STEPS)}"
+            )
+            self.next_btn.setText("Next")
+        else:
+            self.grounding_label.setText("🌿 You're here, right now. Well done.")
+            self.grounding_progress.setText("")
+            self.next_btn.setText("Start over")
+    
+    def next_grounding_step(self):
+        if self.grounding_fade.state() == QAbstractAnimation.Running:
+            return
+        self.text_swapped = False
+        self.grounding_opacity.setEnabled(True)
+        self.grounding_fade.start()
+    
+    def on_grounding_frame(self, value):
+        # First half fades out, second half fades back in with the new step
+        if value >= 0.5 and not self.text_swapped:
+            self.text_swapped = True
+            if self.grounding_step >= len(self.GROUNDING_STEPS):
+                self.grounding_step = 0
+            else:
+                self.grounding_step += 1
+            self.show_grounding_step()
+        self.grounding_opacity.setOpacity(abs(1.0 - 2.0 * value))
+    
+    def done(self, result):
+        self.stop_animations()
+        super().done(result)
 
 class ADHDTaskManager(QMainWindow):
     def __init__(self):
         super().__init__()
         self.tasks = []
         self.focus_mode = False
-        self.points = 0
-        self.streak = 0
+        self.focus_started = None
+        self.focus_task = None
+        self.stats_dirty = False
+        self.ledger_path = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppDataLocation),
+            "xp_ledger.jsonl",
+        )
+        self.ledger, discarded_ledger = XPLedger.load(self.ledger_path)
+        # Saves run one at a time, in order, on their own thread. They are
+        # kept out of self.background so nothing cancels or times out a
+        # write that is already under way
+        self.ledger_writer = ThreadPoolExecutor(max_workers=1)
+        self.background = BackgroundTasks()
+        self.calm_dialog = None
         self.init_ui()
+        if discarded_ledger:
+            self.statusBar().showMessage(
+                f"⚠️ Saved progress could not be read and was moved to {discarded_ledger}"
+            )
     
     def init_ui(self):
         self.setWindowTitle("ADHD Task Manager - Focus & Achieve")
@@ -459,7 +1167,7 @@ class ADHDTaskManager(QMainWindow):
         focus_btn.clicked.connect(self.toggle_focus_mode)
         
         # Stats display
-        self.stats_label = QLabel(f"🏆 Points: {self.points}  🔥 Streak: {self.streak} days")
+        self.stats_label = QLabel()
         self.stats_label.setStyleSheet("""
             font-size: 15px;
             font-weight: bold;
@@ -471,6 +1179,7 @@ class ADHDTaskManager(QMainWindow):
         layout.addWidget(focus_btn)
         layout.addStretch()
         layout.addWidget(self.stats_label)
+        self.update_stats()
         
         top_widget.setLayout(layout)
         return top_widget
@@ -488,6 +1197,7 @@ class ADHDTaskManager(QMainWindow):
         
         # Header
         header = QLabel("START A NEW PROJECT")
+        self.tasks_header = header
         header.setAlignment(Qt.AlignCenter)
         header.setStyleSheet("""
             background-color: white;
@@ -555,10 +1265,12 @@ class ADHDTaskManager(QMainWindow):
         
         # Timer
         self.pomodoro_timer = PomodoroTimer()
+        self.pomodoro_timer.session_completed.connect(self.on_focus_session_completed)
         layout.addWidget(self.pomodoro_timer)
         
         # Stats and motivation
         stats_widget = QWidget()
+        self.motivation_widget = stats_widget
         stats_layout = QVBoxLayout()
         stats_layout.setContentsMargins(20, 20, 20, 20)
         
@@ -697,24 +1409,51 @@ class ADHDTaskManager(QMainWindow):
         cancel_btn.clicked.connect(dialog.reject)
         title_input.returnPressed.connect(on_add)
         
-        dialog.exec_()
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.open()
     
     def add_task_card(self, task):
         card = TaskCard(task)
         card.task_completed.connect(self.on_task_completed)
         card.task_deleted.connect(self.on_task_deleted)
+        card.task_broken_down.connect(self.on_task_broken_down)
+        card.task_uncompleted.connect(self.on_task_uncompleted)
         
         # Insert at the beginning (before stretch)
         self.tasks_layout.insertWidget(0, card)
+        if self.focus_mode:
+            self.apply_focus_layout()
     
-    def on_task_completed(self, task):
-        self.points += 10
-        self.streak += 1
+    def record_xp(self, kind):
+        event = self.ledger.record(kind)
         self.update_stats()
+        self.save_ledger(event)
+    
+    def save_ledger(self, event):
+        # Only the new event is appended; the writer thread runs appends in
+        # the order they were made
+        saved = asyncio.wrap_future(
+            self.ledger_writer.submit(append_event, self.ledger_path, event)
+        )
+        saved.add_done_callback(self.on_ledger_saved)
+    
+    def on_ledger_saved(self, saved):
+        if not saved.cancelled() and saved.exception() is not None:
+            self.statusBar().showMessage(
+                f"⚠️ Could not save progress: {saved.exception()}", 5000
+            )
+    
+    def on_task_completed(self, task):
+        self.record_xp(TASK_COMPLETED)
+        if self.focus_mode:
+            self.apply_focus_layout()
         
         msg = QMessageBox(self)
         msg.setWindowTitle("Task Completed! 🎉")
-        msg.setText(f"Great job! You earned 10 points!\n\nTotal Points: {self.points}")
+        msg.setText(
+            f"Great job! You earned {XP_PER_TASK} XP!\n\n"
+            f"Total XP: {self.ledger.total_xp}  (Level {self.ledger.level})"
+        )
         msg.setIcon(QMessageBox.Information)
         msg.setStyleSheet("""
             QMessageBox {
@@ -725,100 +1464,144 @@ class ADHDTaskManager(QMainWindow):
                 color: #333;
             }
         """)
-        msg.exec_()
+        msg.setAttribute(Qt.WA_DeleteOnClose)
+        msg.open()
+    
+    def on_task_uncompleted(self, task):
+        self.record_xp(TASK_UNCOMPLETED)
+        self.statusBar().showMessage(f"↩️ Task reopened: {task.title}", 3000)
+    
+    def on_task_broken_down(self, task):
+        self.record_xp(TASK_BROKEN_DOWN)
+    
+    def on_focus_session_completed(self):
+        self.record_xp(FOCUS_SESSION)
     
     def on_task_deleted(self, task):
         if task in self.tasks:
             self.tasks.remove(task)
+        if not task.completed:
+            self.record_xp(TASK_DELETED)
         
         # Find and remove the card
         for i in range(self.tasks_layout.count()):
             widget = self.tasks_layout.itemAt(i).widget()
             if isinstance(widget, TaskCard) and widget.task == task:
+                self.tasks_layout.removeWidget(widget)
                 widget.deleteLater()
                 break
+        if self.focus_mode:
+            self.apply_focus_layout()
         
         self.statusBar().showMessage("Task deleted", 2000)
     
+    def task_cards(self):
+        for i in range(self.tasks_layout.count()):
+            widget = self.tasks_layout.itemAt(i).widget()
+            if isinstance(widget, TaskCard):
+                yield widget
+    
+    def apply_focus_layout(self):
+        """Show only the task card being focused on.
+
+        The focused task stays put until it is completed or deleted; then the
+        first unfinished card takes over. Hidden cards are not painted at all,
+        and their step widgets are released so they hold no layout or paint
+        work while focus mode lasts.
+        """
+        cards = list(self.task_cards())
+        active = next(
+            (card for card in cards
+             if card.task is self.focus_task and not card.task.completed),
+            None,
+        )
+        if active is None:
+            active = next((card for card in cards if not card.task.completed), None)
+        self.focus_task = active.task if active else None
+        for card in cards:
+            if card is active:
+                card.show()
+            else:
+                card.release_details()
+                card.hide()
+    
     def toggle_focus_mode(self, checked):
         self.focus_mode = checked
+        for widget in (self.tasks_header, self.motivation_widget, self.stats_label):
+            widget.setVisible(not checked)
+        self.pomodoro_timer.set_low_power(checked)
         if checked:
+            self.focus_started = (time.monotonic(), time.process_time())
+            self.focus_task = None
+            self.apply_focus_layout()
             self.statusBar().showMessage("🎯 Focus Mode ON - Minimize distractions!")
-            # Could implement hiding non-essential UI elements
         else:
-            self.statusBar().showMessage("Focus Mode OFF")
+            self.focus_task = None
+            for card in self.task_cards():
+                card.show()
+            if self.stats_dirty:
+                self.update_stats()
+            wall_start, cpu_start = self.focus_started
+            minutes = (time.monotonic() - wall_start) / 60
+            cpu_seconds = time.process_time() - cpu_start
+            cpu_per_minute = cpu_seconds / minutes if minutes > 0 else 0
+            self.statusBar().showMessage(
+                f"Focus Mode OFF - {minutes:.0f} min session, "
+                f"{cpu_per_minute:.2f} CPU-s/min"
+            )
     
     def update_stats(self):
-        self.stats_label.setText(f"🏆 Points: {self.points}  🔥 Streak: {self.streak} days")
+        # The stats label is hidden in focus mode; refresh it on the way out
+        if self.focus_mode:
+            self.stats_dirty = True
+            return
+        self.stats_dirty = False
+        self.stats_label.setText(
+            f"⭐ Level {self.ledger.level}  🏆 XP: {self.ledger.total_xp}  "
+            f"✅ Today: {self.ledger.tasks_completed_today()}  "
+            f"🔥 Streak: {self.ledger.streak()} days"
+        )
     
     def show_calm_down(self):
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Calm Down Exercises")
-        dialog.setModal(True)
-        dialog.setMinimumSize(500, 400)
-        
-        layout = QVBoxLayout()
-        
-        title = QLabel("🧘 Take a Moment to Breathe")
-        title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet("font-size: 20px; font-weight: bold; padding: 20px;")
-        
-        text = QLabel(
-            "Try these calming techniques:\n\n"
-            "🌬️ Box Breathing:\n"
-            "Breathe in for 4 counts\n"
-            "Hold for 4 counts\n"
-            "Breathe out for 4 counts\n"
-            "Hold for 4 counts\n"
-            "Repeat 4 times\n\n"
-            "🧠 5-4-3-2-1 Grounding:\n"
-            "Name 5 things you can see\n"
-            "4 things you can touch\n"
-            "3 things you can hear\n"
-            "2 things you can smell\n"
-            "1 thing you can taste"
-        )
-        text.setStyleSheet("""
-            font-size: 14px;
-            line-height: 1.8;
-            padding: 20px;
-            background-color: #f0f8ff;
-            border-radius: 10px;
-        """)
-        text.setWordWrap(True)
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(dialog.accept)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-        """)
-        
-        layout.addWidget(title)
-        layout.addWidget(text)
-        layout.addWidget(close_btn)
-        
-        dialog.setLayout(layout)
-        dialog.exec_()
+        # Built once and reused; reopening only resets the exercise
+        if self.calm_dialog is None:
+            self.calm_dialog = CalmDownDialog(self)
+        self.calm_dialog.reset()
+        self.calm_dialog.open()
+    
+    def closeEvent(self, event):
+        self.background.cancel_all()
+        # Let queued appends finish, then rewrite the log in one pass, which
+        # also restores any event whose append failed
+        self.ledger_writer.shutdown(wait=True)
+        try:
+            self.ledger.save(self.ledger_path)
+        except OSError as error:
+            print(f"Could not save progress: {error}", file=sys.stderr)
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
+    app.setApplicationName("ADHD Task Manager")
     
     # Set application-wide font
     font = QFont("Segoe UI", 10)
     app.setFont(font)
     
+    # Qt and asyncio share one event loop, so coroutines started through
+    # BackgroundTasks run between Qt events on the UI thread
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    loop.slow_callback_duration = 0.016
+    
     window = ADHDTaskManager()
     window.show()
     
-    sys.exit(app.exec_())
+    with loop:
+        if os.environ.get("ADHD_LOOP_STATS"):
+            loop.set_debug(True)
+            asyncio.ensure_future(monitor_loop_latency())
+        loop.run_forever()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
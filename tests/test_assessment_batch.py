@@ -0,0 +1,110 @@
+import math
+
+import numpy as np
+
+from assessment_batch import (
+    CATEGORICAL_FIELDS, DEFAULT_SUPPORT, FREQUENCY_FIELDS, HYPER_ITEMS, INATTENTION_ITEMS,
+    OTHER, SUBTYPE_MARGIN, SUBTYPES, aggregate, build_report, merge, parse_lines,
+    score_records,
+)
+
+QUESTION = {field: question for question, field in FREQUENCY_FIELDS.items()}
+
+
+def answers(inattention, hyper):
+    """A record answering every inattention item with one value and every
+    hyperactivity item with another."""
+    record = {QUESTION[item]: inattention for item in INATTENTION_ITEMS}
+    record.update({QUESTION[item]: hyper for item in HYPER_ITEMS})
+    return record
+
+
+def test_blank_answers_score_as_never():
+    scores = score_records([{}, {question: "" for question in FREQUENCY_FIELDS}])
+    assert list(scores["inattention"]) == [len(INATTENTION_ITEMS)] * 2
+    assert list(scores["hyperactivity"]) == [len(HYPER_ITEMS)] * 2
+
+
+def test_unknown_answers_score_zero():
+    record = answers("never", "never")
+    record["q1"] = "constantly"
+    scores = score_records([record])
+    assert scores["inattention"][0] == len(INATTENTION_ITEMS) - 1
+
+
+def test_social_support_defaults_to_three():
+    scores = score_records([{}, {"q13": "unsure"}, {"q13": "Very"}])
+    assert list(scores["social_support"]) == [DEFAULT_SUPPORT, DEFAULT_SUPPORT, 4]
+
+
+def test_unknown_categories_count_as_other():
+    records = [{"q12": "remote", "q14": "Quiet", "q15": "noise"},
+               {"q12": "on a boat", "q14": "library", "q15": ""}]
+    scores = score_records(records)
+    for field, mapping in CATEGORICAL_FIELDS.values():
+        assert scores[field][1] == len(mapping)
+
+    totals = aggregate(scores)
+    report = build_report(totals, len(records), elapsed=1.0, workers=1)
+    combined = report["subtypes"]["combined"]
+    assert combined["work_environment"] == {"Remote": 1, OTHER: 1}
+    assert combined["largest_distraction"] == {"Noise": 1, OTHER: 1}
+
+
+def test_reported_frequencies_leave_blanks_out_of_the_mean():
+    records = [{"q16": "often", "q17": ""}, {"q16": "", "q17": "whenever"}, {"q16": "never"}]
+    scores = score_records(records)
+    assert scores["emotional_swings"][0] == 4
+    assert math.isnan(scores["emotional_swings"][1])
+    assert all(math.isnan(value) for value in scores["stress_impact"])
+
+    report = build_report(aggregate(scores), len(records), elapsed=1.0, workers=1)
+    combined = report["subtypes"]["combined"]
+    assert combined["mean_emotional_swings"] == 2.5
+    assert combined["emotional_swings_answered"] == 2
+    assert combined["mean_stress_impact"] is None
+
+
+def test_sharded_totals_match_unsharded():
+    levels = ["never", "rarely", "sometimes", "often", "very-often", ""]
+    rng = np.random.default_rng(7)
+    records = []
+    for _ in range(300):
+        record = {question: levels[rng.integers(len(levels))] for question in FREQUENCY_FIELDS}
+        record.update({"q13": "moderately", "q16": levels[rng.integers(len(levels))],
+                       "q12": ["remote", "other", ""][rng.integers(3)]})
+        records.append(record)
+
+    whole = aggregate(score_records(records))
+    totals = None
+    for start in range(0, len(records), 70):
+        totals = merge(totals, aggregate(score_records(records[start:start + 70])))
+
+    assert whole.keys() == totals.keys()
+    for key in whole:
+        np.testing.assert_allclose(totals[key], whole[key])
+
+
+def test_subtype_margin_edges():
+    assert SUBTYPE_MARGIN == 1.0
+    just_under = answers("often", "sometimes")
+    just_under["q1"] = "sometimes"
+    records = [
+        answers("often", "sometimes"),     # leads by exactly one step
+        just_under,                         # leads by less than one step
+        answers("often", "very-often"),    # trails by exactly one step
+        answers("sometimes", "sometimes"),
+    ]
+    subtypes = [SUBTYPES[i] for i in score_records(records)["subtype"]]
+    assert subtypes == ["inattentive", "combined", "hyperactive", "combined"]
+
+
+def test_parse_lines_skips_records_that_are_not_objects(capsys):
+    lines = ['{"q1": "often"}\n', "\n", "[1, 2]\n", "{broken\n", '"text"\n', '{"q6": "never"}\n']
+    records, rejected = parse_lines(lines, first_line=41)
+    assert records == [{"q1": "often"}, {"q6": "never"}]
+    assert rejected == 3
+    logged = capsys.readouterr().err
+    assert [line.split(":")[0] for line in logged.splitlines()] == [
+        "Skipping line 43", "Skipping line 44", "Skipping line 45",
+    ]
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from gamification import (
+    TASK_COMPLETED, XPEvent, XPLedger, append_event, calculate_level, write_atomic,
+)
+
+DAY = datetime(2026, 1, 5, 10)
+
+
+def days(n):
+    return DAY + timedelta(days=n)
+
+
+def test_calculate_level_matches_frontend_thresholds():
+    assert calculate_level(0) == (1, 0, 50)
+    assert calculate_level(50) == (2, 0, 100)
+    assert calculate_level(175) == (3, 25, 75)
+
+
+def test_streak_counts_consecutive_days_and_expires():
+    ledger = XPLedger()
+    for n in range(3):
+        ledger.record_task_completed(days(n))
+    assert ledger.streak(days(2).date()) == 3
+    assert ledger.streak(days(3).date()) == 3
+    assert ledger.streak(days(4).date()) == 0
+
+
+def test_replay_into_existing_history_rebuilds_in_order():
+    ledger = XPLedger()
+    ledger.record_task_completed(days(5))
+    ledger.replay([XPEvent(TASK_COMPLETED, days(3)), XPEvent(TASK_COMPLETED, days(4))])
+
+    assert ledger.last_completion_day == days(5).date()
+    assert ledger.streak(days(5).date()) == 3
+    assert ledger.tasks_completed_today(days(5).date()) == 1
+    assert [event.timestamp for event in ledger.events] == [days(3), days(4), days(5)]
+
+
+def test_uncompleting_a_days_only_task_restores_previous_day():
+    ledger = XPLedger()
+    ledger.record_task_completed(days(0))
+    ledger.record_task_completed(days(0) + timedelta(hours=1))
+    ledger.record_task_completed(days(1))
+    ledger.record_task_uncompleted(days(1) + timedelta(hours=1))
+
+    assert ledger.tasks_completed_today(days(0).date()) == 2
+    assert ledger.tasks_completed_today(days(1).date()) == 0
+    assert ledger.streak(days(1).date()) == 1
+    assert ledger.total_xp == 10
+
+
+def test_xp_never_goes_negative():
+    ledger = XPLedger()
+    ledger.record_task_deleted(days(0))
+    assert ledger.total_xp == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    ledger = XPLedger()
+    ledger.record_task_completed(days(0))
+    ledger.save(path)
+    append_event(path, ledger.record_focus_session(days(1)))
+
+    loaded, discarded = XPLedger.load(path)
+    assert discarded is None
+    assert loaded.stats(days(1).date()) == ledger.stats(days(1).date())
+    missing, discarded = XPLedger.load(str(tmp_path / "missing.jsonl"))
+    assert missing.total_xp == 0 and discarded is None
+
+
+def test_load_drops_a_partial_last_line(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    ledger = XPLedger()
+    ledger.record_task_completed(days(0))
+    path.write_text(ledger.to_jsonl() + '["task_compl')
+
+    loaded, discarded = XPLedger.load(str(path))
+    assert discarded is None
+    assert loaded.tasks_completed == 1
+
+
+def test_load_moves_an_unreadable_ledger_aside(tmp_path):
+    for content in ('["task_completed", "2026-01-05T10:00:00"]\n{not json\n',
+                    '["levelled_up", "2026-01-05T10:00:00"]\n'):
+        path = tmp_path / "ledger.jsonl"
+        path.write_text(content)
+
+        loaded, discarded = XPLedger.load(str(path))
+        assert loaded.total_xp == 0
+        assert not path.exists()
+        with open(discarded) as f:
+            assert f.read() == content
+        os.remove(discarded)
+
+
+def test_concurrent_atomic_writes_do_not_collide(tmp_path):
+    path = str(tmp_path / "ledger.json")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [pool.submit(write_atomic, path, str(n)) for n in range(200)]:
+            future.result()
+    assert os.listdir(tmp_path) == ["ledger.json"]